@@ -1,7 +1,7 @@
 # Copyright 2022 Amethyst Reese
 # Licensed under the MIT license
 
-from .cli import CliTest
+from .cli import CliTest, StdinTest
 from .config import ConfigTest
 from .core import CoreTest
 from .util import UtilTest
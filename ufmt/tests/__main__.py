@@ -7,4 +7,4 @@ from ufmt.cli import init_logging
 
 if __name__ == "__main__":  # pragma: no cover
     init_logging()
-    unittest.main(module="ufmt.tests", verbosity=2)
+    unittest.main(module="ufmt.tests", verbosity=2, buffer=True)
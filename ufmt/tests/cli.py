@@ -1,283 +1,275 @@
 # Copyright 2022 Amethyst Reese
 # Licensed under the MIT license
 
-import os
 import platform
-from concurrent.futures import ThreadPoolExecutor
+import shutil
+from concurrent.futures import Executor, Future
 from pathlib import Path
-from tempfile import TemporaryDirectory
+from tempfile import mkdtemp, TemporaryDirectory
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Tuple, TypeVar
 from unittest import skipIf, TestCase
-from unittest.mock import call, Mock, patch
+from unittest.mock import call, DEFAULT, Mock, patch
 
 import trailrunner
 from click.testing import CliRunner
 from libcst import ParserSyntaxError
+from typing_extensions import ParamSpec
 
 from ufmt.cli import echo_results, main
-from ufmt.types import Result
+from ufmt.core import ufmt_bytes
+from ufmt.types import BlackConfig, FileContent, Result, UsortConfig
 
 from .core import CORRECTLY_FORMATTED_CODE, POORLY_FORMATTED_CODE
 
+P = ParamSpec("P")
+T = TypeVar("T")
+
+WINDOWS = platform.system() == "Windows"
+
+P_DOT = Path(".")
+P_BAR = Path("bar.py")
+P_FOO = Path("foo.py")
+P_FROB = Path("foo/frob.py")
+P_FOO_BAR = Path("foo/bar.py")
+P_BUZZ = Path("fuzz/buzz.py")
+P_RAKE = Path("make/rake.py")
+
+CORRECTLY_FORMATTED_BYTES = CORRECTLY_FORMATTED_CODE.encode()
+POORLY_FORMATTED_BYTES = POORLY_FORMATTED_CODE.encode()
+
+SYNTAX_ERROR = ParserSyntaxError(
+    "bad",
+    lines=("", "", "", "foo bar fizzbuzz hello world"),
+    raw_line=4,
+    raw_column=15,
+)
+
+
+ECHO_RESULTS = [
+    Result(P_FOO_BAR, changed=False),
+    Result(P_BUZZ, changed=True, written=False, diff="fakediff1"),
+    Result(P_RAKE, changed=True, written=True, diff="fakediff2"),
+]
+
+ECHO_ERROR_RESULTS = [
+    Result(P_FOO_BAR, changed=False),
+    Result(P_BUZZ, error=AssertionError()),
+    Result(P_RAKE, error=Exception("something weird happened")),
+]
+
+FORMAT_CACHE: Dict[Tuple[Path, FileContent], FileContent] = {}
+
+
+def cached_ufmt_bytes(path: Path, content: FileContent, **kwargs: Any) -> FileContent:
+    """Memoized ufmt_bytes, so repeated stdin fixtures only get formatted once."""
+    key = (path, content)
+    if key not in FORMAT_CACHE:
+        FORMAT_CACHE[key] = ufmt_bytes(path, content, **kwargs)
+    return FORMAT_CACHE[key]
+
+
+class InlineExecutor(Executor):
+    """Run every job immediately on the calling thread, skipping pools entirely."""
+
+    def submit(
+        self, fn: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> "Future[T]":
+        future: "Future[T]" = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as error:  # pragma: no cover
+            future.set_exception(error)
+        return future
+
+
+EXECUTOR_PATCH = patch.object(
+    trailrunner.core.Trailrunner, "DEFAULT_EXECUTOR", InlineExecutor
+)
+
+
+def setUpModule() -> None:
+    EXECUTOR_PATCH.start()
+
+
+def tearDownModule() -> None:
+    EXECUTOR_PATCH.stop()
+
 
-@patch.object(trailrunner.core.Trailrunner, "DEFAULT_EXECUTOR", ThreadPoolExecutor)
 class CliTest(TestCase):
+    runner: ClassVar[CliRunner]
+    td: ClassVar["TemporaryDirectory[str]"]
+    root: ClassVar[Path]
+
+    # (name, results, args, expected paths, stderr fragment, dry run exit, format exit)
+    SCENARIOS: Tuple[
+        Tuple[str, List[Result], List[str], List[Path], Optional[str], int, int], ...
+    ] = (
+        (
+            "no paths given",
+            [],
+            [],
+            [P_DOT],
+            "No files found",
+            0,
+            0,
+        ),
+        (
+            "already formatted",
+            [
+                Result(P_BAR, changed=False),
+                Result(P_FROB, changed=False),
+            ],
+            ["bar.py", "foo/frob.py"],
+            [P_BAR, P_FROB],
+            None,
+            0,
+            0,
+        ),
+        (
+            "needs formatting",
+            [
+                Result(P_BAR, changed=False),
+                Result(P_FROB, changed=True),
+            ],
+            ["bar.py", "foo/frob.py"],
+            [P_BAR, P_FROB],
+            None,
+            1,
+            0,
+        ),
+        (
+            "syntax error",
+            [
+                Result(P_BAR, changed=False),
+                Result(P_FROB, error=SYNTAX_ERROR),
+            ],
+            ["bar.py", "foo/frob.py"],
+            [P_BAR, P_FROB],
+            "frob.py: Syntax Error @ 4:16",
+            1,
+            1,
+        ),
+        (
+            "skipped file",
+            [
+                Result(P_FOO, skipped="special"),
+            ],
+            ["foo.py"],
+            [P_FOO],
+            "Skipped foo.py: special",
+            0,
+            0,
+        ),
+    )
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.runner = CliRunner(mix_stderr=False)
+        cls.td = TemporaryDirectory()
+        cls.root = Path(cls.td.name).resolve()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.td.cleanup()
+
     def setUp(self) -> None:
-        self.runner = CliRunner(mix_stderr=False)
-        self.cwd = os.getcwd()
-        self.td = TemporaryDirectory()
-        self.tdp = Path(self.td.name).resolve()
-        os.chdir(self.tdp)
+        self.tdp = Path(mkdtemp(dir=self.root))
 
     def tearDown(self) -> None:
-        os.chdir(self.cwd)
-        self.td.cleanup()
-
-    @patch("ufmt.cli.echo_color_precomputed_diff")
-    @patch("ufmt.cli.click.secho")
-    def test_echo(self, echo_mock: Mock, mol_mock: Mock) -> None:
-        f1 = Path("foo/bar.py")
-        f2 = Path("fuzz/buzz.py")
-        f3 = Path("make/rake.py")
-        results = [
-            Result(f1, changed=False),
-            Result(f2, changed=True, written=False, diff="fakediff1"),
-            Result(f3, changed=True, written=True, diff="fakediff2"),
-        ]
-
-        with self.subTest("no diff"):
-            echo_results(results)
-            echo_mock.assert_has_calls(
+        shutil.rmtree(self.tdp, ignore_errors=True)
+
+    def test_echo(self) -> None:
+        echo_patch = patch.multiple(
+            "ufmt.cli", click=DEFAULT, echo_color_precomputed_diff=DEFAULT
+        )
+
+        with self.subTest("no diff"), echo_patch as mocks:
+            mocks["click"].style.side_effect = lambda text, **kwargs: text
+            echo_results(ECHO_RESULTS)
+            mocks["click"].secho.assert_has_calls(
                 [
-                    call(f"Would format {f2}", err=True),
-                    call(f"Formatted {f3}", err=True),
+                    call(f"Would format {P_BUZZ}", err=True),
+                    call(f"Formatted {P_RAKE}", err=True),
                 ]
             )
-            mol_mock.assert_not_called()
-            echo_mock.reset_mock()
-            mol_mock.reset_mock()
+            mocks["echo_color_precomputed_diff"].assert_not_called()
 
-        with self.subTest("with diff"):
-            echo_results(results, diff=True)
-            echo_mock.assert_has_calls(
+        with self.subTest("with diff"), echo_patch as mocks:
+            mocks["click"].style.side_effect = lambda text, **kwargs: text
+            echo_results(ECHO_RESULTS, diff=True)
+            mocks["click"].secho.assert_has_calls(
                 [
-                    call(f"Would format {f2}", err=True),
-                    call(f"Formatted {f3}", err=True),
+                    call(f"Would format {P_BUZZ}", err=True),
+                    call(f"Formatted {P_RAKE}", err=True),
                 ]
             )
-            mol_mock.assert_has_calls(
+            mocks["echo_color_precomputed_diff"].assert_has_calls(
                 [
                     call("fakediff1"),
                     call("fakediff2"),
                 ]
             )
-            echo_mock.reset_mock()
-            mol_mock.reset_mock()
-
-        with self.subTest("upstream exception"):
-            results = [
-                Result(f1, changed=False),
-                Result(f2, error=AssertionError()),
-                Result(f3, error=Exception("something weird happened")),
-            ]
-            echo_results(results)
 
-            echo_mock.assert_has_calls(
+        with self.subTest("upstream exception"), echo_patch as mocks:
+            mocks["click"].style.side_effect = lambda text, **kwargs: text
+            echo_results(ECHO_ERROR_RESULTS)
+
+            mocks["click"].secho.assert_has_calls(
                 [
                     call(
-                        f"Error formatting {f2}: AssertionError()",
+                        f"Error formatting {P_BUZZ}: AssertionError()",
                         fg="yellow",
                         err=True,
                     ),
                     call(
-                        f"Error formatting {f3}: something weird happened",
+                        f"Error formatting {P_RAKE}: something weird happened",
                         fg="yellow",
                         err=True,
                     ),
                 ]
             )
-            mol_mock.assert_not_called()
-            echo_mock.reset_mock()
-            mol_mock.reset_mock()
+            mocks["echo_color_precomputed_diff"].assert_not_called()
 
     @patch("ufmt.cli.ufmt_paths")
     def test_check(self, ufmt_mock: Mock) -> None:
-        with self.subTest("no paths given"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = []
-            result = self.runner.invoke(main, ["check"])
-            ufmt_mock.assert_called_with(
-                [Path(".")], dry_run=True, concurrency=None, root=None
-            )
-            self.assertRegex(result.stderr, r"No files found")
-            self.assertEqual(0, result.exit_code)
-
-        with self.subTest("already formatted"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = [
-                Result(Path("bar.py"), changed=False),
-                Result(Path("foo/frob.py"), changed=False),
-            ]
-            result = self.runner.invoke(main, ["check", "bar.py", "foo/frob.py"])
-            ufmt_mock.assert_called_with(
-                [Path("bar.py"), Path("foo/frob.py")],
-                dry_run=True,
-                concurrency=None,
-                root=None,
-            )
-            self.assertEqual(0, result.exit_code)
-
-        with self.subTest("needs formatting"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = [
-                Result(Path("bar.py"), changed=False),
-                Result(Path("foo/frob.py"), changed=True),
-            ]
-            result = self.runner.invoke(main, ["check", "bar.py", "foo/frob.py"])
-            ufmt_mock.assert_called_with(
-                [Path("bar.py"), Path("foo/frob.py")],
-                dry_run=True,
-                concurrency=None,
-                root=None,
-            )
-            self.assertEqual(1, result.exit_code)
-
-        with self.subTest("syntax error"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = [
-                Result(Path("bar.py"), changed=False),
-                Result(
-                    Path("foo/frob.py"),
-                    error=ParserSyntaxError(
-                        "bad",
-                        lines=("", "", "", "foo bar fizzbuzz hello world"),
-                        raw_line=4,
-                        raw_column=15,
-                    ),
-                ),
-            ]
-            result = self.runner.invoke(main, ["check", "bar.py", "foo/frob.py"])
-            ufmt_mock.assert_called_with(
-                [Path("bar.py"), Path("foo/frob.py")],
-                dry_run=True,
-                concurrency=None,
-                root=None,
-            )
-            self.assertRegex(
-                result.stderr, r"Error formatting .*frob\.py: Syntax Error @ 4:16"
-            )
-            self.assertEqual(1, result.exit_code)
-
-        with self.subTest("skipped file"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = [
-                Result(Path("foo.py"), skipped="special"),
-            ]
-            result = self.runner.invoke(main, ["check", "foo.py"])
-            ufmt_mock.assert_called_with(
-                [Path("foo.py")], dry_run=True, concurrency=None, root=None
-            )
-            self.assertRegex(result.stderr, r"Skipped .*foo\.py: special")
-            self.assertEqual(0, result.exit_code)
+        for name, results, args, paths, stderr_fragment, exit_code, _ in self.SCENARIOS:
+            with self.subTest(name):
+                ufmt_mock.return_value = results
+                result = self.runner.invoke(main, ["check", *args])
+                ufmt_mock.assert_called_with(
+                    paths, dry_run=True, concurrency=None, root=None
+                )
+                if stderr_fragment is not None:
+                    self.assertIn(stderr_fragment, result.stderr)
+                self.assertEqual(exit_code, result.exit_code)
 
     @patch("ufmt.cli.ufmt_paths")
     def test_diff(self, ufmt_mock: Mock) -> None:
-        with self.subTest("no paths given"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = []
-            result = self.runner.invoke(main, ["diff"])
-            ufmt_mock.assert_called_with(
-                [Path(".")], dry_run=True, diff=True, concurrency=None, root=None
-            )
-            self.assertRegex(result.stderr, r"No files found")
-            self.assertEqual(0, result.exit_code)
-
-        with self.subTest("already formatted"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = [
-                Result(Path("bar.py"), changed=False),
-                Result(Path("foo/frob.py"), changed=False),
-            ]
-            result = self.runner.invoke(main, ["diff", "bar.py", "foo/frob.py"])
-            ufmt_mock.assert_called_with(
-                [Path("bar.py"), Path("foo/frob.py")],
-                dry_run=True,
-                diff=True,
-                concurrency=None,
-                root=None,
-            )
-            self.assertEqual(0, result.exit_code)
-
-        with self.subTest("needs formatting"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = [
-                Result(Path("bar.py"), changed=False),
-                Result(Path("foo/frob.py"), changed=True),
-            ]
-            result = self.runner.invoke(main, ["diff", "bar.py", "foo/frob.py"])
-            ufmt_mock.assert_called_with(
-                [Path("bar.py"), Path("foo/frob.py")],
-                dry_run=True,
-                diff=True,
-                concurrency=None,
-                root=None,
-            )
-            self.assertEqual(1, result.exit_code)
-
-        with self.subTest("syntax error"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = [
-                Result(Path("bar.py"), changed=False),
-                Result(
-                    Path("foo/frob.py"),
-                    error=ParserSyntaxError(
-                        "bad",
-                        lines=("", "", "", "foo bar fizzbuzz hello world"),
-                        raw_line=4,
-                        raw_column=15,
-                    ),
-                ),
-            ]
-            result = self.runner.invoke(main, ["diff", "bar.py", "foo/frob.py"])
-            ufmt_mock.assert_called_with(
-                [Path("bar.py"), Path("foo/frob.py")],
-                dry_run=True,
-                diff=True,
-                concurrency=None,
-                root=None,
-            )
-            self.assertRegex(
-                result.stderr, r"Error formatting .*frob\.py: Syntax Error @ 4:16"
-            )
-            self.assertEqual(1, result.exit_code)
-
-        with self.subTest("skipped file"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = [
-                Result(Path("foo.py"), skipped="special"),
-            ]
-            result = self.runner.invoke(main, ["diff", "foo.py"])
-            ufmt_mock.assert_called_with(
-                [Path("foo.py")], dry_run=True, diff=True, concurrency=None, root=None
-            )
-            self.assertRegex(result.stderr, r"Skipped .*foo\.py: special")
-            self.assertEqual(0, result.exit_code)
+        for name, results, args, paths, stderr_fragment, exit_code, _ in self.SCENARIOS:
+            with self.subTest(name):
+                ufmt_mock.return_value = results
+                result = self.runner.invoke(main, ["diff", *args])
+                ufmt_mock.assert_called_with(
+                    paths, dry_run=True, diff=True, concurrency=None, root=None
+                )
+                if stderr_fragment is not None:
+                    self.assertIn(stderr_fragment, result.stderr)
+                self.assertEqual(exit_code, result.exit_code)
 
         with self.subTest("skipped file quiet"):
-            ufmt_mock.reset_mock()
             ufmt_mock.return_value = [
-                Result(Path("foo.py"), skipped="special"),
+                Result(P_FOO, skipped="special"),
             ]
             result = self.runner.invoke(main, ["--quiet", "diff", "foo.py"])
             ufmt_mock.assert_called_with(
-                [Path("foo.py")], dry_run=True, diff=True, concurrency=None, root=None
+                [P_FOO], dry_run=True, diff=True, concurrency=None, root=None
             )
             self.assertEqual("", result.stderr)
             self.assertEqual(0, result.exit_code)
 
         with self.subTest("bad root dir"):
-            ufmt_mock.reset_mock()
             ufmt_mock.return_value = [
-                Result(Path("bar.py"), changed=False),
+                Result(P_BAR, changed=False),
             ]
             result = self.runner.invoke(
                 main, ["--root", "DOES_NOT_EXIST", "diff", "bar.py"]
@@ -290,133 +282,16 @@ class CliTest(TestCase):
 
     @patch("ufmt.cli.ufmt_paths")
     def test_format(self, ufmt_mock: Mock) -> None:
-        with self.subTest("no paths given"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = []
-            result = self.runner.invoke(main, ["format"])
-            ufmt_mock.assert_called_with([Path(".")], concurrency=None, root=None)
-            self.assertRegex(result.stderr, r"No files found")
-            self.assertEqual(0, result.exit_code)
-
-        with self.subTest("already formatted"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = [
-                Result(Path("bar.py"), changed=False),
-                Result(Path("foo/frob.py"), changed=False),
-            ]
-            result = self.runner.invoke(main, ["format", "bar.py", "foo/frob.py"])
-            ufmt_mock.assert_called_with(
-                [Path("bar.py"), Path("foo/frob.py")], concurrency=None, root=None
-            )
-            self.assertEqual(0, result.exit_code)
-
-        with self.subTest("needs formatting"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = [
-                Result(Path("bar.py"), changed=False),
-                Result(Path("foo/frob.py"), changed=True),
-            ]
-            result = self.runner.invoke(main, ["format", "bar.py", "foo/frob.py"])
-            ufmt_mock.assert_called_with(
-                [Path("bar.py"), Path("foo/frob.py")], concurrency=None, root=None
-            )
-            self.assertEqual(0, result.exit_code)
-
-        with self.subTest("syntax error"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = [
-                Result(Path("bar.py"), changed=False),
-                Result(
-                    Path("foo/frob.py"),
-                    error=ParserSyntaxError(
-                        "bad",
-                        lines=("", "", "", "foo bar fizzbuzz hello world"),
-                        raw_line=4,
-                        raw_column=15,
-                    ),
-                ),
-            ]
-            result = self.runner.invoke(main, ["format", "bar.py", "foo/frob.py"])
-            ufmt_mock.assert_called_with(
-                [Path("bar.py"), Path("foo/frob.py")], concurrency=None, root=None
-            )
-            self.assertRegex(
-                result.stderr, r"Error formatting .*frob\.py: Syntax Error @ 4:16"
-            )
-            self.assertRegex(result.stderr, " 1 error, 1 file already formatted")
-            self.assertEqual(1, result.exit_code)
-
-        with self.subTest("skipped file"):
-            ufmt_mock.reset_mock()
-            ufmt_mock.return_value = [
-                Result(Path("foo.py"), skipped="special"),
-            ]
-            result = self.runner.invoke(main, ["format", "foo.py"])
-            ufmt_mock.assert_called_with([Path("foo.py")], concurrency=None, root=None)
-            self.assertRegex(result.stderr, r"Skipped .*foo\.py: special")
-            self.assertEqual(0, result.exit_code)
-
-    @skipIf(platform.system() == "Windows", "stderr not supported on Windows")
-    def test_stdin(self) -> None:
-        with self.subTest("check clean"):
-            result = self.runner.invoke(
-                main,
-                ["check", "-", "hello.py"],
-                input=CORRECTLY_FORMATTED_CODE,
-            )
-            self.assertEqual("", result.stdout)
-            self.assertRegex(result.stderr, r"✨ 1 file already formatted ✨")
-            self.assertEqual(0, result.exit_code)
-
-        with self.subTest("check dirty"):
-            result = self.runner.invoke(
-                main,
-                ["check", "-"],
-                input=POORLY_FORMATTED_CODE,
-            )
-            self.assertEqual("", result.stdout)
-            self.assertIn("Would format stdin\n", result.stderr)
-            self.assertEqual(1, result.exit_code)
-
-        with self.subTest("diff clean"):
-            result = self.runner.invoke(
-                main,
-                ["diff", "-", "hello.py"],
-                input=CORRECTLY_FORMATTED_CODE,
-            )
-            self.assertEqual("", result.stdout)
-            self.assertIn("✨ 1 file already formatted ✨", result.stderr)
-            self.assertEqual(0, result.exit_code)
-
-        with self.subTest("diff dirty"):
-            result = self.runner.invoke(
-                main,
-                ["diff", "-", "hello.py"],
-                input=POORLY_FORMATTED_CODE,
-            )
-            self.assertRegex(result.stdout, r"--- hello.py\n\+\+\+ hello.py")
-            self.assertIn("Would format hello.py\n", result.stderr)
-            self.assertEqual(1, result.exit_code)
-
-        with self.subTest("format clean"):
-            result = self.runner.invoke(
-                main,
-                ["format", "-", "hello.py"],
-                input=CORRECTLY_FORMATTED_CODE,
-            )
-            self.assertEqual(CORRECTLY_FORMATTED_CODE, result.stdout)
-            self.assertIn("✨ 1 file already formatted ✨", result.stderr)
-            self.assertEqual(0, result.exit_code)
-
-        with self.subTest("format dirty"):
-            result = self.runner.invoke(
-                main,
-                ["format", "-", "hello.py"],
-                input=POORLY_FORMATTED_CODE,
-            )
-            self.assertEqual(CORRECTLY_FORMATTED_CODE, result.stdout)
-            self.assertIn("Formatted hello.py\n", result.stderr)
-            self.assertEqual(0, result.exit_code)
+        for name, results, args, paths, stderr_fragment, _, exit_code in self.SCENARIOS:
+            with self.subTest(name):
+                ufmt_mock.return_value = results
+                result = self.runner.invoke(main, ["format", *args])
+                ufmt_mock.assert_called_with(paths, concurrency=None, root=None)
+                if stderr_fragment is not None:
+                    self.assertIn(stderr_fragment, result.stderr)
+                if name == "syntax error":
+                    self.assertIn(" 1 error, 1 file already formatted", result.stderr)
+                self.assertEqual(exit_code, result.exit_code)
 
     def test_end_to_end(self) -> None:
         alpha = self.tdp / "alpha.py"
@@ -510,3 +385,84 @@ class CliTest(TestCase):
 
             lsp_mock.assert_called_with(root=None)
             lsp_mock.return_value.start_ws.assert_called_with("localhost", 8765)
+
+
+class StdinTest(TestCase):
+    runner: ClassVar[CliRunner]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.runner = CliRunner(mix_stderr=False)
+        # prime black, usort, and LibCST so the first subtest isn't paying
+        # their one-time startup costs
+        ufmt_bytes(
+            P_FOO,
+            b"import foo\n",
+            black_config=BlackConfig(),
+            usort_config=UsortConfig(),
+        )
+
+    @skipIf(WINDOWS, "stderr not supported on Windows")
+    @patch("ufmt.core.ufmt_bytes", cached_ufmt_bytes)
+    def test_stdin(self) -> None:
+        # anchor CWD in an empty dir so formatting never picks up project config
+        with self.runner.isolated_filesystem():
+            with self.subTest("check clean"):
+                result = self.runner.invoke(
+                    main,
+                    ["check", "-", "hello.py"],
+                    input=CORRECTLY_FORMATTED_BYTES,
+                )
+                self.assertEqual("", result.stdout)
+                self.assertIn("✨ 1 file already formatted ✨", result.stderr)
+                self.assertEqual(0, result.exit_code)
+
+            with self.subTest("check dirty"):
+                result = self.runner.invoke(
+                    main,
+                    ["check", "-"],
+                    input=POORLY_FORMATTED_BYTES,
+                )
+                self.assertEqual("", result.stdout)
+                self.assertIn("Would format stdin\n", result.stderr)
+                self.assertEqual(1, result.exit_code)
+
+            with self.subTest("diff clean"):
+                result = self.runner.invoke(
+                    main,
+                    ["diff", "-", "hello.py"],
+                    input=CORRECTLY_FORMATTED_BYTES,
+                )
+                self.assertEqual("", result.stdout)
+                self.assertIn("✨ 1 file already formatted ✨", result.stderr)
+                self.assertEqual(0, result.exit_code)
+
+            with self.subTest("diff dirty"):
+                result = self.runner.invoke(
+                    main,
+                    ["diff", "-", "hello.py"],
+                    input=POORLY_FORMATTED_BYTES,
+                )
+                self.assertIn("--- hello.py\n+++ hello.py", result.stdout)
+                self.assertIn("Would format hello.py\n", result.stderr)
+                self.assertEqual(1, result.exit_code)
+
+            with self.subTest("format clean"):
+                result = self.runner.invoke(
+                    main,
+                    ["format", "-", "hello.py"],
+                    input=CORRECTLY_FORMATTED_BYTES,
+                )
+                self.assertEqual(CORRECTLY_FORMATTED_CODE, result.stdout)
+                self.assertIn("✨ 1 file already formatted ✨", result.stderr)
+                self.assertEqual(0, result.exit_code)
+
+            with self.subTest("format dirty"):
+                result = self.runner.invoke(
+                    main,
+                    ["format", "-", "hello.py"],
+                    input=POORLY_FORMATTED_BYTES,
+                )
+                self.assertEqual(CORRECTLY_FORMATTED_CODE, result.stdout)
+                self.assertIn("Formatted hello.py\n", result.stderr)
+                self.assertEqual(0, result.exit_code)